@@ -1,23 +1,42 @@
 from __future__ import annotations
 
 import hashlib
+import heapq
+import hmac
+import itertools
 import secrets
+import time
 from collections import defaultdict
+from collections.abc import KeysView
 from datetime import UTC, date, datetime, timedelta
-from decimal import Decimal
+from decimal import Decimal, localcontext
 from enum import Enum
+from functools import cached_property
 from typing import Annotated
 from uuid import UUID, uuid4
 
 import jwt
-from fastapi import Depends, FastAPI, Header, HTTPException, Query, status
-from fastapi.responses import FileResponse
-from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from fastapi import Body, Depends, FastAPI, Header, HTTPException, Query, Response, status
+from fastapi.responses import FileResponse, ORJSONResponse
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, TypeAdapter
 
-app = FastAPI(title="TripWallet API", version="0.2.0")
+app = FastAPI(title="TripWallet API", version="0.2.0", default_response_class=ORJSONResponse)
 
 JWT_SECRET = "dev-secret-change-me"
 JWT_ALGO = "HS256"
+# Prepared once so token handling does not re-encode the key or rebuild options per request.
+JWT_KEY = JWT_SECRET.encode()
+JWT_ALGORITHMS = (JWT_ALGO,)
+jwt_codec = jwt.PyJWT(options={"require": ["exp", "sub"]})
+TOKEN_CACHE_MAX_SIZE = 10_000
+EXPENSE_BATCH_MAX_SIZE = 500
+# Expired invites are evicted on every Nth invite creation.
+INVITE_SWEEP_INTERVAL = 64
+
+# scrypt cost for password hashes: 16 MiB of memory and a few tens of ms per hash.
+SCRYPT_N = 2**14
+SCRYPT_R = 8
+SCRYPT_P = 1
 
 CURRENCY_ALIASES = {
     "EU": "EUR",
@@ -35,6 +54,9 @@ USD_VALUE_BY_CURRENCY: dict[str, Decimal] = {
     "CNY": Decimal("0.139"),
 }
 
+# Analytics sum base amounts as integers of 10**-BASE_UNIT_SCALE units instead of Decimals.
+BASE_UNIT_SCALE = 8
+
 DEFAULT_TEST_ACCOUNTS = (
     {"email": "user1@example.com", "display_name": "user1", "password": "123456"},
     {"email": "user2@example.com", "display_name": "user2", "password": "123456"},
@@ -52,6 +74,8 @@ class MemberRole(str, Enum):
 
 
 class User(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: UUID
     email: EmailStr
     password_hash: str
@@ -60,6 +84,8 @@ class User(BaseModel):
 
 
 class Trip(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: UUID
     owner_user_id: UUID
     name: str
@@ -71,6 +97,8 @@ class Trip(BaseModel):
 
 
 class TripMember(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: UUID
     trip_id: UUID
     user_id: UUID
@@ -90,6 +118,9 @@ class TripInvite(BaseModel):
 
 
 class Expense(BaseModel):
+    # Frozen: updates build a new Expense, so the cached derived values below never go stale.
+    model_config = ConfigDict(frozen=True)
+
     id: UUID
     trip_id: UUID
     created_by_user_id: UUID
@@ -112,6 +143,26 @@ class Expense(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+    @cached_property
+    def amount_in_base_units(self) -> int:
+        return int(self.amount_in_base.scaleb(BASE_UNIT_SCALE).to_integral_value())
+
+    @cached_property
+    def amount_in_base_exponent(self) -> int:
+        return max(self.amount_in_base.as_tuple().exponent, -BASE_UNIT_SCALE)
+
+    @cached_property
+    def paid_by_user_id_str(self) -> str:
+        return str(self.paid_by_user_id)
+
+    @cached_property
+    def expense_date_ord(self) -> int:
+        return self.expense_time.toordinal()
+
+    @cached_property
+    def expense_date_iso(self) -> str:
+        return self.expense_time.date().isoformat()
+
 
 # request/response schemas
 class SignupRequest(BaseModel):
@@ -144,6 +195,8 @@ class CreateTripRequest(BaseModel):
 
 
 class TripResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: UUID
     owner_user_id: UUID
     name: str
@@ -167,6 +220,8 @@ class InviteResponse(BaseModel):
 
 
 class MemberResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     user_id: UUID
     role: MemberRole
     display_name: str
@@ -210,6 +265,8 @@ class UpdateExpenseRequest(BaseModel):
 
 
 class ExpenseResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: UUID
     trip_id: UUID
     created_by_user_id: UUID
@@ -232,19 +289,38 @@ class ExpenseResponse(BaseModel):
 
 
 class SummaryResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     total_spending_in_base: Decimal
     total_spending_by_member: dict[str, Decimal]
     total_spending_by_category: dict[str, Decimal]
     total_spending_by_day: dict[str, Decimal]
 
 
+# Built once; dump_json serializes a whole list to bytes in pydantic-core.
+TRIP_LIST_ADAPTER = TypeAdapter(list[TripResponse])
+MEMBER_LIST_ADAPTER = TypeAdapter(list[MemberResponse])
+EXPENSE_LIST_ADAPTER = TypeAdapter(list[ExpenseResponse])
+
+
 users: dict[UUID, User] = {}
 users_by_email: dict[str, UUID] = {}
 trips: dict[UUID, Trip] = {}
-trip_members: dict[UUID, list[TripMember]] = defaultdict(list)
+# trip id -> user id -> membership, so membership checks are a dict lookup.
+trip_members: dict[UUID, dict[UUID, TripMember]] = defaultdict(dict)
+# Reverse index of trip_members: user id -> ids of the trips they belong to.
+user_trips: dict[UUID, set[UUID]] = defaultdict(set)
 trip_invites: dict[UUID, TripInvite] = {}
 invite_index: dict[str, UUID] = {}
+# Min-heap of (expires_at, invite_code) for invites that can expire.
+invite_expiry: list[tuple[datetime, str]] = []
+invite_counter = itertools.count(1)
 expenses: dict[UUID, list[Expense]] = defaultdict(list)
+# trip id -> computed summaries (key None: whole trip, user id: that user's expenses).
+# Dropped whenever the trip's expenses change.
+summary_cache: dict[UUID, dict[UUID | None, SummaryResponse]] = {}
+# Verified bearer tokens -> (user id, exp), so warm tokens skip the HMAC check.
+token_cache: dict[str, tuple[UUID, int]] = {}
 
 
 def ensure_default_test_accounts() -> None:
@@ -260,8 +336,24 @@ def now_utc() -> datetime:
     return datetime.now(UTC)
 
 
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, dklen=32)
+
+
 def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode()).hexdigest()
+    salt = secrets.token_bytes(16)
+    digest = _scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${salt.hex()}${digest.hex()}"
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    try:
+        _, n, r, p, salt, digest = password_hash.split("$")
+        expected = bytes.fromhex(digest)
+        actual = _scrypt(password, bytes.fromhex(salt), int(n), int(r), int(p))
+    except ValueError:
+        return False
+    return hmac.compare_digest(actual, expected)
 
 
 def issue_token(user: User) -> str:
@@ -270,7 +362,7 @@ def issue_token(user: User) -> str:
         "email": user.email,
         "exp": int((now_utc() + timedelta(days=2)).timestamp()),
     }
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGO)
+    return jwt_codec.encode(payload, JWT_KEY, algorithm=JWT_ALGO)
 
 
 def parse_token(auth_header: str | None) -> User:
@@ -278,11 +370,20 @@ def parse_token(auth_header: str | None) -> User:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing bearer token")
 
     token = auth_header.split(" ", 1)[1]
-    try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGO])
-        user_id = UUID(payload["sub"])
-    except Exception as exc:  # noqa: BLE001
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token") from exc
+    cached = token_cache.get(token)
+    if cached and cached[1] > time.time():
+        user_id = cached[0]
+    else:
+        try:
+            payload = jwt_codec.decode(token, JWT_KEY, algorithms=JWT_ALGORITHMS)
+            user_id = UUID(payload["sub"])
+        except Exception as exc:  # noqa: BLE001
+            token_cache.pop(token, None)
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token") from exc
+        if len(token_cache) >= TOKEN_CACHE_MAX_SIZE:
+            # Evict the oldest entry (dicts keep insertion order); tolerate a concurrent eviction.
+            token_cache.pop(next(iter(token_cache), None), None)
+        token_cache[token] = (user_id, payload["exp"])
 
     user = users.get(user_id)
     if not user:
@@ -295,10 +396,10 @@ def current_user(authorization: Annotated[str | None, Header()] = None) -> User:
 
 
 def ensure_membership(trip_id: UUID, user_id: UUID) -> TripMember:
-    for member in trip_members.get(trip_id, []):
-        if member.user_id == user_id:
-            return member
-    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a trip member")
+    member = trip_members.get(trip_id, {}).get(user_id)
+    if not member:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a trip member")
+    return member
 
 
 def ensure_owner(trip_id: UUID, user_id: UUID) -> None:
@@ -311,8 +412,49 @@ def serialize_user(user: User) -> UserResponse:
     return UserResponse(id=user.id, email=user.email, display_name=user.display_name)
 
 
+def json_response(content: bytes | str, status_code: int = status.HTTP_200_OK) -> Response:
+    # For payloads already serialized by pydantic; bypasses jsonable_encoder and response_model.
+    return Response(content, status_code=status_code, media_type="application/json")
+
+
 def serialize_trip(trip: Trip) -> TripResponse:
-    return TripResponse(**trip.model_dump())
+    # Trip is already validated; model_construct skips a second validation pass.
+    return TripResponse.model_construct(**trip.__dict__)
+
+
+def serialize_member(member: TripMember) -> MemberResponse:
+    return MemberResponse.model_construct(
+        user_id=member.user_id,
+        role=member.role,
+        display_name=users[member.user_id].display_name,
+        nickname_in_trip=member.nickname_in_trip,
+    )
+
+
+def serialize_expense(expense: Expense) -> ExpenseResponse:
+    return ExpenseResponse.model_construct(**expense.__dict__)
+
+
+def add_trip_member(member: TripMember) -> None:
+    trip_members[member.trip_id][member.user_id] = member
+    user_trips[member.user_id].add(member.trip_id)
+
+
+def remove_trip_member(trip_id: UUID, user_id: UUID) -> None:
+    # Both are O(1); lookups via .get so removing a non-member allocates nothing.
+    trip_members.get(trip_id, {}).pop(user_id, None)
+    joined = user_trips.get(user_id)
+    if joined is not None:
+        joined.discard(trip_id)
+
+
+def sweep_expired_invites(now: datetime) -> None:
+    while invite_expiry and invite_expiry[0][0] <= now:
+        _, code = heapq.heappop(invite_expiry)
+        trip_id = invite_index.pop(code, None)
+        invite = trip_invites.get(trip_id) if trip_id else None
+        if invite and invite.invite_code == code:
+            invite.is_active = False
 
 
 def create_user(email: str, password: str, display_name: str) -> User:
@@ -321,7 +463,7 @@ def create_user(email: str, password: str, display_name: str) -> User:
         email=email,
         password_hash=hash_password(password),
         display_name=display_name,
-        created_at=datetime.now(UTC),
+        created_at=now_utc(),
     )
     users[user.id] = user
     users_by_email[email] = user.id
@@ -330,6 +472,9 @@ def create_user(email: str, password: str, display_name: str) -> User:
 
 ensure_default_test_accounts()
 
+# Verified against on logins for unknown emails so they cost the same as a wrong password.
+DUMMY_PASSWORD_HASH = hash_password(secrets.token_urlsafe(16))
+
 
 def normalize_currency(currency: str) -> str:
     upper = currency.upper().strip()
@@ -344,8 +489,9 @@ def latest_fx_rate(source_currency: str, target_currency: str) -> Decimal | None
     return source_to_usd / target_to_usd
 
 
-def member_ids_for_trip(trip_id: UUID) -> set[UUID]:
-    return {member.user_id for member in trip_members.get(trip_id, [])}
+def member_ids_for_trip(trip_id: UUID) -> KeysView[UUID]:
+    # A live view over the membership dict: set-like O(1) lookups with nothing to rebuild or invalidate.
+    return trip_members.get(trip_id, {}).keys()
 
 
 def normalize_split(
@@ -372,22 +518,32 @@ def normalize_split(
     if not custom_split_amounts:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="custom_split_amounts is required")
 
+    # Validate, normalize and total the custom amounts in a single pass.
     normalized: dict[str, Decimal] = {}
+    seen: set[UUID] = set()
+    running = Decimal("0")
     for user_id, value in custom_split_amounts.items():
         uid = UUID(user_id)
         if uid not in members:
             raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="custom split user must be a trip member")
+        if uid in seen:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="custom split users must match split_with_user_ids",
+            )
         amount_value = Decimal(value)
         if amount_value < 0:
             raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="custom split amount must be >= 0")
         normalized[str(uid)] = amount_value
+        seen.add(uid)
+        running += amount_value
 
-    if set(normalized.keys()) != {str(user_id) for user_id in chosen_members}:
+    if seen != set(chosen_members):
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="custom split users must match split_with_user_ids",
         )
-    if sum(normalized.values(), start=Decimal("0")) != amount:
+    if running != amount:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="custom split must sum to amount")
     return split_mode, chosen_members, normalized
 
@@ -422,9 +578,10 @@ def signup(payload: SignupRequest) -> AuthResponse:
 def login(payload: LoginRequest) -> AuthResponse:
     user_id = users_by_email.get(payload.email.lower())
     if not user_id:
+        verify_password(payload.password, DUMMY_PASSWORD_HASH)
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     user = users[user_id]
-    if user.password_hash != hash_password(payload.password):
+    if not verify_password(payload.password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     return AuthResponse(access_token=issue_token(user))
 
@@ -436,6 +593,7 @@ def me(user: User = Depends(current_user)) -> UserResponse:
 
 @app.post("/trips", response_model=TripResponse)
 def create_trip(payload: CreateTripRequest, user: User = Depends(current_user)) -> TripResponse:
+    now = now_utc()
     trip = Trip(
         id=uuid4(),
         owner_user_id=user.id,
@@ -444,25 +602,26 @@ def create_trip(payload: CreateTripRequest, user: User = Depends(current_user))
         end_date=payload.end_date,
         base_currency=normalize_currency(payload.base_currency),
         status=TripStatus.active,
-        created_at=now_utc(),
+        created_at=now,
     )
     trips[trip.id] = trip
-    trip_members[trip.id].append(
+    add_trip_member(
         TripMember(
             id=uuid4(),
             trip_id=trip.id,
             user_id=user.id,
             role=MemberRole.owner,
-            joined_at=now_utc(),
+            joined_at=now,
         )
     )
     return serialize_trip(trip)
 
 
 @app.get("/trips", response_model=list[TripResponse])
-def list_trips(user: User = Depends(current_user)) -> list[TripResponse]:
-    joined_trip_ids = {m.trip_id for ms in trip_members.values() for m in ms if m.user_id == user.id}
-    return [serialize_trip(trips[trip_id]) for trip_id in joined_trip_ids]
+def list_trips(user: User = Depends(current_user)) -> Response:
+    # Snapshot the live set: a concurrent create/join may add to it mid-loop.
+    joined_trip_ids = tuple(user_trips.get(user.id, ()))
+    return json_response(TRIP_LIST_ADAPTER.dump_json([serialize_trip(trips[trip_id]) for trip_id in joined_trip_ids]))
 
 
 @app.get("/trips/{trip_id}", response_model=TripResponse)
@@ -486,9 +645,10 @@ def create_invite(trip_id: UUID, payload: InviteRequest, user: User = Depends(cu
         invite_index.pop(existing.invite_code, None)
 
     code = secrets.token_urlsafe(6)
+    now = now_utc()
     expires_at = None
     if payload.expires_in_hours is not None:
-        expires_at = now_utc() + timedelta(hours=payload.expires_in_hours)
+        expires_at = now + timedelta(hours=payload.expires_in_hours)
 
     invite = TripInvite(
         id=uuid4(),
@@ -496,16 +656,23 @@ def create_invite(trip_id: UUID, payload: InviteRequest, user: User = Depends(cu
         invite_code=code,
         expires_at=expires_at,
         is_active=True,
-        created_at=now_utc(),
+        created_at=now,
         created_by_user_id=user.id,
     )
     trip_invites[trip_id] = invite
     invite_index[code] = trip_id
+    if expires_at is not None:
+        heapq.heappush(invite_expiry, (expires_at, code))
+    if next(invite_counter) % INVITE_SWEEP_INTERVAL == 0:
+        sweep_expired_invites(now)
     return InviteResponse(invite_code=code, expires_at=expires_at)
 
 
 @app.post("/trips/join", status_code=status.HTTP_201_CREATED)
 def join_trip(payload: JoinTripRequest, user: User = Depends(current_user)) -> dict[str, str]:
+    # Sweeping first drops every expired code, so an expired invite always answers 404 below.
+    now = now_utc()
+    sweep_expired_invites(now)
     trip_id = invite_index.get(payload.invite_code)
     if not trip_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invite code not found")
@@ -513,37 +680,28 @@ def join_trip(payload: JoinTripRequest, user: User = Depends(current_user)) -> d
     invite = trip_invites[trip_id]
     if not invite.is_active:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invite inactive")
-    if invite.expires_at and invite.expires_at < now_utc():
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invite expired")
 
-    for member in trip_members[trip_id]:
-        if member.user_id == user.id:
-            return {"status": "already_joined"}
+    if user.id in trip_members[trip_id]:
+        return {"status": "already_joined"}
 
-    trip_members[trip_id].append(
+    add_trip_member(
         TripMember(
             id=uuid4(),
             trip_id=trip_id,
             user_id=user.id,
             role=MemberRole.member,
-            joined_at=now_utc(),
+            joined_at=now,
         )
     )
     return {"status": "joined"}
 
 
 @app.get("/trips/{trip_id}/members", response_model=list[MemberResponse])
-def list_members(trip_id: UUID, user: User = Depends(current_user)) -> list[MemberResponse]:
+def list_members(trip_id: UUID, user: User = Depends(current_user)) -> Response:
     ensure_membership(trip_id, user.id)
-    return [
-        MemberResponse(
-            user_id=m.user_id,
-            role=m.role,
-            display_name=users[m.user_id].display_name,
-            nickname_in_trip=m.nickname_in_trip,
-        )
-        for m in trip_members[trip_id]
-    ]
+    # Snapshot first: a concurrent join_trip may insert into the live dict mid-loop.
+    members = list(trip_members[trip_id].values())
+    return json_response(MEMBER_LIST_ADAPTER.dump_json([serialize_member(m) for m in members]))
 
 
 @app.delete("/trips/{trip_id}/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT, response_model=None)
@@ -555,19 +713,12 @@ def remove_member(trip_id: UUID, user_id: UUID, user: User = Depends(current_use
     if user_id == trip.owner_user_id:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot remove owner")
 
-    members = trip_members[trip_id]
-    new_members = [m for m in members if m.user_id != user_id]
-    trip_members[trip_id] = new_members
+    remove_trip_member(trip_id, user_id)
     return None
 
 
-@app.post("/trips/{trip_id}/expenses", response_model=ExpenseResponse, status_code=status.HTTP_201_CREATED)
-def create_expense(trip_id: UUID, payload: CreateExpenseRequest, user: User = Depends(current_user)) -> ExpenseResponse:
-    ensure_membership(trip_id, user.id)
-    trip = trips.get(trip_id)
-    if not trip:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trip not found")
-
+def build_expense(trip: Trip, payload: CreateExpenseRequest, user: User, now: datetime) -> Expense:
+    # The caller has already checked that user is a member of trip.
     currency = normalize_currency(payload.currency)
     target_currency = normalize_currency(payload.target_currency or trip.base_currency)
 
@@ -591,14 +742,14 @@ def create_expense(trip_id: UUID, payload: CreateExpenseRequest, user: User = De
             raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="fx_rate_to_base is required")
         fx = auto_fx_base
 
+    members = member_ids_for_trip(trip.id)
     payer_id = payload.paid_by_user_id or user.id
-    ensure_membership(trip_id, payer_id)
-
     owner_id = payload.owner_user_id or user.id
-    ensure_membership(trip_id, owner_id)
+    if payer_id not in members or owner_id not in members:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not a trip member")
 
     split_mode, split_user_ids, custom_split = normalize_split(
-        trip_id,
+        trip.id,
         payload.amount,
         payload.split_mode,
         payload.split_with_user_ids,
@@ -607,9 +758,9 @@ def create_expense(trip_id: UUID, payload: CreateExpenseRequest, user: User = De
 
     amount_in_base = payload.amount * fx
     amount_in_target = payload.amount * fx_to_target
-    expense = Expense(
+    return Expense(
         id=uuid4(),
-        trip_id=trip_id,
+        trip_id=trip.id,
         created_by_user_id=user.id,
         owner_user_id=owner_id,
         paid_by_user_id=payer_id,
@@ -627,11 +778,49 @@ def create_expense(trip_id: UUID, payload: CreateExpenseRequest, user: User = De
         split_with_user_ids=split_user_ids,
         custom_split_amounts=custom_split,
         expense_time=payload.expense_time,
-        created_at=now_utc(),
-        updated_at=now_utc(),
+        created_at=now,
+        updated_at=now,
     )
+
+
+@app.post("/trips/{trip_id}/expenses", response_model=ExpenseResponse, status_code=status.HTTP_201_CREATED)
+def create_expense(trip_id: UUID, payload: CreateExpenseRequest, user: User = Depends(current_user)) -> Response:
+    ensure_membership(trip_id, user.id)
+    trip = trips.get(trip_id)
+    if not trip:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trip not found")
+
+    expense = build_expense(trip, payload, user, now_utc())
     expenses[trip_id].append(expense)
-    return ExpenseResponse(**expense.model_dump())
+    summary_cache.pop(trip_id, None)
+    return json_response(serialize_expense(expense).model_dump_json(), status_code=status.HTTP_201_CREATED)
+
+
+@app.post("/trips/{trip_id}/expenses:batch", response_model=list[ExpenseResponse], status_code=status.HTTP_201_CREATED)
+def batch_create_expenses(
+    trip_id: UUID,
+    payloads: Annotated[list[CreateExpenseRequest], Body(min_length=1, max_length=EXPENSE_BATCH_MAX_SIZE)],
+    user: User = Depends(current_user),
+) -> Response:
+    ensure_membership(trip_id, user.id)
+    trip = trips.get(trip_id)
+    if not trip:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trip not found")
+
+    # All-or-nothing: every row is validated before any is stored.
+    now = now_utc()
+    created: list[Expense] = []
+    for index, payload in enumerate(payloads):
+        try:
+            created.append(build_expense(trip, payload, user, now))
+        except HTTPException as exc:
+            raise HTTPException(status_code=exc.status_code, detail={"index": index, "detail": exc.detail}) from exc
+    expenses[trip_id].extend(created)
+    summary_cache.pop(trip_id, None)
+    return json_response(
+        EXPENSE_LIST_ADAPTER.dump_json([serialize_expense(expense) for expense in created]),
+        status_code=status.HTTP_201_CREATED,
+    )
 
 
 @app.get("/trips/{trip_id}/expenses", response_model=list[ExpenseResponse])
@@ -642,22 +831,27 @@ def list_expenses(
     to_date: date | None = Query(default=None, alias="to"),
     paid_by: UUID | None = None,
     category: str | None = None,
-) -> list[ExpenseResponse]:
+) -> Response:
     ensure_membership(trip_id, user.id)
-    items = expenses.get(trip_id, [])
+    from_ord = from_date.toordinal() if from_date else None
+    to_ord = to_date.toordinal() if to_date else None
 
-    def include(item: Expense) -> bool:
-        if from_date and item.expense_time.date() < from_date:
-            return False
-        if to_date and item.expense_time.date() > to_date:
-            return False
+    # Single pass: cheap equality filters first, date ordinals compared as ints.
+    out: list[ExpenseResponse] = []
+    append = out.append
+    for item in expenses.get(trip_id, []):
         if paid_by and item.paid_by_user_id != paid_by:
-            return False
+            continue
         if category and item.category != category:
-            return False
-        return True
-
-    return [ExpenseResponse(**item.model_dump()) for item in items if include(item)]
+            continue
+        if from_ord is not None or to_ord is not None:
+            day = item.expense_date_ord
+            if from_ord is not None and day < from_ord:
+                continue
+            if to_ord is not None and day > to_ord:
+                continue
+        append(serialize_expense(item))
+    return json_response(EXPENSE_LIST_ADAPTER.dump_json(out))
 
 
 @app.patch("/trips/{trip_id}/expenses/{expense_id}", response_model=ExpenseResponse)
@@ -666,7 +860,7 @@ def update_expense(
     expense_id: UUID,
     payload: UpdateExpenseRequest,
     user: User = Depends(current_user),
-) -> ExpenseResponse:
+) -> Response:
     ensure_membership(trip_id, user.id)
     trip = trips.get(trip_id)
     if not trip:
@@ -729,7 +923,8 @@ def update_expense(
 
         updated = Expense(**new_data)
         trip_expenses[idx] = updated
-        return ExpenseResponse(**updated.model_dump())
+        summary_cache.pop(trip_id, None)
+        return json_response(serialize_expense(updated).model_dump_json())
 
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Expense not found")
 
@@ -747,38 +942,66 @@ def delete_expense(trip_id: UUID, expense_id: UUID, user: User = Depends(current
             if item.created_by_user_id != user.id:
                 raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Cannot delete others' expenses")
             del trip_expenses[idx]
+            summary_cache.pop(trip_id, None)
             return None
     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Expense not found")
 
 
 def compute_summary(items: list[Expense]) -> SummaryResponse:
-    total = Decimal("0")
-    by_member: dict[str, Decimal] = defaultdict(lambda: Decimal("0"))
-    by_category: dict[str, Decimal] = defaultdict(lambda: Decimal("0"))
-    by_day: dict[str, Decimal] = defaultdict(lambda: Decimal("0"))
+    total = 0
+    exponent = 0
+    by_member: dict[str, int] = {}
+    by_category: dict[str, int] = {}
+    by_day: dict[str, int] = {}
 
     for item in items:
-        total += item.amount_in_base
-        by_member[str(item.paid_by_user_id)] += item.amount_in_base
-        by_category[item.category] += item.amount_in_base
-        by_day[item.expense_time.date().isoformat()] += item.amount_in_base
+        units = item.amount_in_base_units
+        total += units
+        key = item.paid_by_user_id_str
+        by_member[key] = by_member.get(key, 0) + units
+        key = item.category
+        by_category[key] = by_category.get(key, 0) + units
+        key = item.expense_date_iso
+        by_day[key] = by_day.get(key, 0) + units
+        if item.amount_in_base_exponent < exponent:
+            exponent = item.amount_in_base_exponent
+
+    # Report sums with the finest precision among the summed amounts, as Decimal addition would.
+    quantum = Decimal(1).scaleb(exponent)
+
+    def to_decimal(value: int) -> Decimal:
+        # Large sums can need more than the default 28 digits at this quantum; widen the context
+        # so quantize() stays exact instead of raising InvalidOperation.
+        with localcontext() as ctx:
+            ctx.prec = max(ctx.prec, len(str(abs(value))) + 2)
+            return Decimal(value).scaleb(-BASE_UNIT_SCALE).quantize(quantum)
 
     return SummaryResponse(
-        total_spending_in_base=total,
-        total_spending_by_member=dict(by_member),
-        total_spending_by_category=dict(by_category),
-        total_spending_by_day=dict(by_day),
+        total_spending_in_base=to_decimal(total),
+        total_spending_by_member={key: to_decimal(value) for key, value in by_member.items()},
+        total_spending_by_category={key: to_decimal(value) for key, value in by_category.items()},
+        total_spending_by_day={key: to_decimal(value) for key, value in by_day.items()},
     )
 
 
+def cached_summary(trip_id: UUID, created_by_user_id: UUID | None = None) -> SummaryResponse:
+    cached = summary_cache.setdefault(trip_id, {})
+    summary = cached.get(created_by_user_id)
+    if summary is None:
+        items = expenses.get(trip_id, [])
+        if created_by_user_id is not None:
+            items = [e for e in items if e.created_by_user_id == created_by_user_id]
+        summary = cached[created_by_user_id] = compute_summary(items)
+    return summary
+
+
 @app.get("/trips/{trip_id}/analytics/summary", response_model=SummaryResponse)
-def analytics_summary(trip_id: UUID, user: User = Depends(current_user)) -> SummaryResponse:
+def analytics_summary(trip_id: UUID, user: User = Depends(current_user)) -> Response:
     ensure_membership(trip_id, user.id)
-    return compute_summary(expenses.get(trip_id, []))
+    return json_response(cached_summary(trip_id).model_dump_json())
 
 
 @app.get("/trips/{trip_id}/analytics/me", response_model=SummaryResponse)
-def analytics_me(trip_id: UUID, user: User = Depends(current_user)) -> SummaryResponse:
+def analytics_me(trip_id: UUID, user: User = Depends(current_user)) -> Response:
     ensure_membership(trip_id, user.id)
-    mine = [e for e in expenses.get(trip_id, []) if e.created_by_user_id == user.id]
-    return compute_summary(mine)
+    return json_response(cached_summary(trip_id, user.id).model_dump_json())
@@ -1,7 +1,11 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal, localcontext
+from uuid import UUID
 
+import pytest
 from fastapi.testclient import TestClient
 
+from app import main
 from app.main import app
 
 
@@ -120,3 +124,291 @@ def test_default_testing_accounts_can_login() -> None:
     user2 = client.post("/auth/login", json={"email": "user2@example.com", "password": "123456"})
     assert user2.status_code == 200
     assert user2.json()["access_token"]
+
+
+def test_list_endpoints_return_serialized_models() -> None:
+    token = signup("lists@example.com", "Lister")
+
+    trip_resp = client.post(
+        "/trips",
+        headers=auth_header(token),
+        json={"name": "Seoul", "base_currency": "USD"},
+    )
+    trip_id = trip_resp.json()["id"]
+
+    for category in ("food", "hotel"):
+        resp = client.post(
+            f"/trips/{trip_id}/expenses",
+            headers=auth_header(token),
+            json={
+                "amount": "12.50",
+                "currency": "USD",
+                "category": category,
+                "expense_time": "2025-05-01T10:00:00+00:00",
+            },
+        )
+        assert resp.status_code == 201
+
+    trips_resp = client.get("/trips", headers=auth_header(token))
+    assert trips_resp.status_code == 200
+    assert [t["id"] for t in trips_resp.json()] == [trip_id]
+
+    members_resp = client.get(f"/trips/{trip_id}/members", headers=auth_header(token))
+    assert members_resp.status_code == 200
+    assert members_resp.json()[0]["display_name"] == "Lister"
+    assert members_resp.json()[0]["role"] == "owner"
+
+    expenses_resp = client.get(f"/trips/{trip_id}/expenses", headers=auth_header(token))
+    assert expenses_resp.status_code == 200
+    assert len(expenses_resp.json()) == 2
+    assert expenses_resp.json()[0]["amount"] == "12.50"
+
+    filtered = client.get(
+        f"/trips/{trip_id}/expenses",
+        headers=auth_header(token),
+        params={"category": "hotel", "from": "2025-05-01", "to": "2025-05-01"},
+    )
+    assert [e["category"] for e in filtered.json()] == ["hotel"]
+    out_of_range = client.get(f"/trips/{trip_id}/expenses", headers=auth_header(token), params={"from": "2025-05-02"})
+    assert out_of_range.json() == []
+
+    me_resp = client.get(f"/trips/{trip_id}/analytics/me", headers=auth_header(token))
+    assert me_resp.status_code == 200
+    assert me_resp.json()["total_spending_in_base"] == "25.00"
+    assert me_resp.json()["total_spending_by_day"] == {"2025-05-01": "25.00"}
+
+
+def test_removed_member_loses_trip_access() -> None:
+    owner_token = signup("kick-owner@example.com", "Owner")
+    member_token = signup("kicked@example.com", "Kicked")
+    member_id = client.get("/me", headers=auth_header(member_token)).json()["id"]
+
+    trip_id = client.post(
+        "/trips",
+        headers=auth_header(owner_token),
+        json={"name": "Osaka", "base_currency": "JPY"},
+    ).json()["id"]
+    code = client.post(f"/trips/{trip_id}/invite", headers=auth_header(owner_token), json={}).json()["invite_code"]
+
+    assert client.post("/trips/join", headers=auth_header(member_token), json={"invite_code": code}).json() == {
+        "status": "joined"
+    }
+    assert client.post("/trips/join", headers=auth_header(member_token), json={"invite_code": code}).json() == {
+        "status": "already_joined"
+    }
+    assert [t["id"] for t in client.get("/trips", headers=auth_header(member_token)).json()] == [trip_id]
+    assert len(client.get(f"/trips/{trip_id}/members", headers=auth_header(owner_token)).json()) == 2
+
+    remove_resp = client.delete(f"/trips/{trip_id}/members/{member_id}", headers=auth_header(owner_token))
+    assert remove_resp.status_code == 204
+
+    assert client.get("/trips", headers=auth_header(member_token)).json() == []
+    assert client.get(f"/trips/{trip_id}", headers=auth_header(member_token)).status_code == 403
+    assert len(client.get(f"/trips/{trip_id}/members", headers=auth_header(owner_token)).json()) == 1
+
+
+def test_login_rejects_wrong_password() -> None:
+    signup("wrong-pw@example.com", "Wrong")
+
+    ok = client.post("/auth/login", json={"email": "Wrong-PW@example.com", "password": "secret123"})
+    assert ok.status_code == 200
+
+    bad = client.post("/auth/login", json={"email": "wrong-pw@example.com", "password": "secret124"})
+    assert bad.status_code == 401
+
+
+def test_token_validation() -> None:
+    token = signup("tokens@example.com", "Tokens")
+
+    for _ in range(2):
+        assert client.get("/me", headers=auth_header(token)).status_code == 200
+
+    header, payload, signature = token.split(".")
+    mid = len(signature) // 2
+    flipped = "A" if signature[mid] != "A" else "B"
+    tampered = ".".join((header, payload, signature[:mid] + flipped + signature[mid + 1 :]))
+    assert client.get("/me", headers=auth_header(tampered)).status_code == 401
+    assert client.get("/me").status_code == 401
+
+
+def test_summary_reflects_expense_changes() -> None:
+    token = signup("summary@example.com", "Summary")
+    trip_id = client.post(
+        "/trips",
+        headers=auth_header(token),
+        json={"name": "Paris", "base_currency": "EUR"},
+    ).json()["id"]
+
+    def add_expense(amount: str) -> str:
+        resp = client.post(
+            f"/trips/{trip_id}/expenses",
+            headers=auth_header(token),
+            json={"amount": amount, "currency": "EUR", "category": "food", "expense_time": "2025-06-01T12:00:00+00:00"},
+        )
+        assert resp.status_code == 201
+        return resp.json()["id"]
+
+    def total() -> str:
+        return client.get(f"/trips/{trip_id}/analytics/summary", headers=auth_header(token)).json()[
+            "total_spending_in_base"
+        ]
+
+    first_id = add_expense("10")
+    assert total() == "10"
+    add_expense("2.5")
+    assert total() == "12.5"
+
+    patch_resp = client.patch(
+        f"/trips/{trip_id}/expenses/{first_id}",
+        headers=auth_header(token),
+        json={"amount": "20"},
+    )
+    assert patch_resp.status_code == 200
+    assert total() == "22.5"
+
+    assert client.delete(f"/trips/{trip_id}/expenses/{first_id}", headers=auth_header(token)).status_code == 204
+    assert total() == "2.5"
+    me = client.get(f"/trips/{trip_id}/analytics/me", headers=auth_header(token)).json()
+    assert me["total_spending_by_category"] == {"food": "2.5"}
+
+
+def test_custom_split_validation() -> None:
+    owner_token = signup("split-owner@example.com", "Owner")
+    member_token = signup("split-member@example.com", "Member")
+    owner_id = client.get("/me", headers=auth_header(owner_token)).json()["id"]
+    member_id = client.get("/me", headers=auth_header(member_token)).json()["id"]
+
+    trip_id = client.post(
+        "/trips",
+        headers=auth_header(owner_token),
+        json={"name": "Rome", "base_currency": "EUR"},
+    ).json()["id"]
+    code = client.post(f"/trips/{trip_id}/invite", headers=auth_header(owner_token), json={}).json()["invite_code"]
+    client.post("/trips/join", headers=auth_header(member_token), json={"invite_code": code})
+
+    def create(split_with: list[str], amounts: dict[str, str]) -> int:
+        return client.post(
+            f"/trips/{trip_id}/expenses",
+            headers=auth_header(owner_token),
+            json={
+                "amount": "30",
+                "currency": "EUR",
+                "category": "food",
+                "expense_time": "2025-07-01T19:00:00+00:00",
+                "split_mode": "custom",
+                "split_with_user_ids": split_with,
+                "custom_split_amounts": amounts,
+            },
+        ).status_code
+
+    both = [owner_id, member_id]
+    assert create(both, {owner_id: "10", member_id: "20"}) == 201
+    assert create(both, {owner_id: "10", member_id: "10"}) == 422
+    assert create(both, {owner_id: "30"}) == 422
+    assert create([owner_id], {owner_id: "30", member_id: "0"}) == 422
+
+
+def test_expired_invites_are_swept(monkeypatch: pytest.MonkeyPatch) -> None:
+    owner_token = signup("sweep-owner@example.com", "Owner")
+    joiner_token = signup("sweep-joiner@example.com", "Joiner")
+    trip_id = client.post(
+        "/trips",
+        headers=auth_header(owner_token),
+        json={"name": "Lisbon", "base_currency": "EUR"},
+    ).json()["id"]
+    code = client.post(
+        f"/trips/{trip_id}/invite",
+        headers=auth_header(owner_token),
+        json={"expires_in_hours": 1},
+    ).json()["invite_code"]
+
+    later = datetime.now(timezone.utc) + timedelta(hours=2)
+    monkeypatch.setattr(main, "now_utc", lambda: later)
+
+    join_resp = client.post("/trips/join", headers=auth_header(joiner_token), json={"invite_code": code})
+    assert join_resp.status_code == 404
+    assert join_resp.json()["detail"] == "Invite code not found"
+    assert code not in main.invite_index
+    assert not main.trip_invites[UUID(trip_id)].is_active
+
+
+def test_batch_create_expenses() -> None:
+    token = signup("batch@example.com", "Batch")
+    trip_id = client.post(
+        "/trips",
+        headers=auth_header(token),
+        json={"name": "Berlin", "base_currency": "EUR"},
+    ).json()["id"]
+
+    def row(amount: str, **extra: str) -> dict[str, str]:
+        return {
+            "amount": amount,
+            "currency": "EUR",
+            "category": "food",
+            "expense_time": "2025-08-01T09:00:00+00:00",
+            **extra,
+        }
+
+    batch_resp = client.post(
+        f"/trips/{trip_id}/expenses:batch",
+        headers=auth_header(token),
+        json=[row("4"), row("6", title="Lunch")],
+    )
+    assert batch_resp.status_code == 201
+    assert [e["amount"] for e in batch_resp.json()] == ["4", "6"]
+    assert batch_resp.json()[1]["title"] == "Lunch"
+
+    # One invalid row rejects the whole batch.
+    bad_resp = client.post(
+        f"/trips/{trip_id}/expenses:batch",
+        headers=auth_header(token),
+        json=[row("1"), row("2", currency="XYZ")],
+    )
+    assert bad_resp.status_code == 422
+    assert bad_resp.json()["detail"] == {"index": 1, "detail": "fx_rate_to_target is required"}
+    assert client.post(f"/trips/{trip_id}/expenses:batch", headers=auth_header(token), json=[]).status_code == 422
+
+    assert len(client.get(f"/trips/{trip_id}/expenses", headers=auth_header(token)).json()) == 2
+    summary = client.get(f"/trips/{trip_id}/analytics/summary", headers=auth_header(token)).json()
+    assert summary["total_spending_in_base"] == "10"
+
+
+def test_summary_rounds_auto_fx_amounts_and_handles_large_sums() -> None:
+    token = signup("precision@example.com", "Precision")
+    trip_id = client.post(
+        "/trips",
+        headers=auth_header(token),
+        json={"name": "Sapporo", "base_currency": "JPY"},
+    ).json()["id"]
+
+    def add_eur(amount: str) -> dict[str, str]:
+        resp = client.post(
+            f"/trips/{trip_id}/expenses",
+            headers=auth_header(token),
+            json={"amount": amount, "currency": "EUR", "category": "food", "expense_time": "2025-09-01T12:00:00+00:00"},
+        )
+        assert resp.status_code == 201
+        return resp.json()
+
+    # Summaries are computed in 1e-8 base units, so auto-FX amounts are rounded to 8 places.
+    small = add_eur("10")
+    assert small["amount_in_base"] == "1611.940298507462686567164179"
+    summary = client.get(f"/trips/{trip_id}/analytics/summary", headers=auth_header(token))
+    assert summary.json()["total_spending_in_base"] == "1611.94029851"
+
+    # A huge converted amount plus an 8-place one needs more than 28 digits to report exactly.
+    client.delete(f"/trips/{trip_id}/expenses/{small['id']}", headers=auth_header(token))
+    large = add_eur("100000000000000000000")
+    tiny = client.post(
+        f"/trips/{trip_id}/expenses",
+        headers=auth_header(token),
+        json={"amount": "0.00000001", "currency": "JPY", "category": "food", "expense_time": "2025-09-01T12:00:00+00:00"},
+    )
+    assert tiny.status_code == 201
+    with localcontext() as ctx:
+        ctx.prec = 50
+        expected = str(Decimal(large["amount_in_base"]) + Decimal("0.00000001"))
+    for path in ("summary", "me"):
+        resp = client.get(f"/trips/{trip_id}/analytics/{path}", headers=auth_header(token))
+        assert resp.status_code == 200
+        assert resp.json()["total_spending_in_base"] == expected